@@ -1,61 +1,222 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from pydantic import BaseModel, Field
 from typing import List, Optional
+import msgspec
 import uuid
 from datetime import datetime, date, timedelta
+from functools import lru_cache
+import numpy as np
+import orjson
+import pandas as pd
 import pytz
+import redis.asyncio as redis
 
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection (pre-warmed pool avoids connection storms on cold start)
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=50,
+    minPoolSize=10,
+    maxConnecting=4,
+    serverSelectionTimeoutMS=3000
+)
 db = client[os.environ['DB_NAME']]
 
-# Create the main app without a prefix
-app = FastAPI()
+# Redis connection (caches stats responses until end of day UTC)
+redis_url = os.environ.get('REDIS_URL', 'redis://localhost:6379')
+redis_client = redis.from_url(redis_url)
+
+# Redis set tracking every cached stats key, so invalidation can delete them all
+STATS_CACHE_KEY_SET = "stats:cached-keys"
+
+# Daily counter keys outlive their day by 12h so late readers still hit Redis
+TODAY_COUNT_TTL = 129600
+
+# Create the main app without a prefix (orjson serializes datetimes/UUIDs natively)
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
 
-# Define Models
-class BadDeed(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-    user_id: Optional[str] = None  # For future multi-user support
-    notes: Optional[str] = None    # Optional notes about the bad deed
-
-class BadDeedResponse(BaseModel):
+# Define Models (msgspec Structs decode/encode in C, far cheaper than Pydantic)
+class BadDeedResponse(msgspec.Struct):
     id: str
     timestamp: datetime
     user_id: Optional[str] = None
     notes: Optional[str] = None
 
-class BadDeedCreate(BaseModel):
+class BadDeedCreate(msgspec.Struct):
     notes: Optional[str] = None
 
-class StatsResponse(BaseModel):
+class StatsResponse(msgspec.Struct):
     count: int
     date: str
     day_of_week: str
 
 
+# Reusable decoders/encoder (building them per request would redo schema setup)
+bad_deed_create_decoder = msgspec.json.Decoder(BadDeedCreate)
+bad_deed_create_list_decoder = msgspec.json.Decoder(List[BadDeedCreate])
+json_encoder = msgspec.json.Encoder()
+
+def msgspec_response(obj):
+    """Serialize a msgspec Struct (or list of them) straight to a Response"""
+    return Response(content=json_encoder.encode(obj), media_type="application/json")
+
+def build_deed_doc(notes, ts):
+    """Insertion-ready deed document — single source of the stored shape,
+    including the materialized date fields the stats pipelines group on"""
+    return {
+        "id": uuid.uuid4().hex,
+        "timestamp": ts,
+        "user_id": None,  # For future multi-user support
+        "notes": notes,
+        "date_str": ts.strftime("%Y-%m-%d"),
+        "ym": ts.strftime("%Y-%m"),
+        "dow": ts.weekday()
+    }
+
+
 # Helper functions
 def get_today_start_end():
-    """Get start and end of today in UTC"""
+    """Get start of today and start of tomorrow in UTC (half-open interval)"""
     now = datetime.utcnow()
     today_start = datetime.combine(now.date(), datetime.min.time())
-    today_end = datetime.combine(now.date(), datetime.max.time())
-    return today_start, today_end
+    tomorrow_start = today_start + timedelta(days=1)
+    return today_start, tomorrow_start
+
+@lru_cache(maxsize=4096)
+def iso_date(ordinal):
+    """Memoized YYYY-MM-DD string for a date ordinal"""
+    return date.fromordinal(ordinal).isoformat()
+
+@lru_cache(maxsize=7)
+def day_name(weekday):
+    """Memoized day name for a Python weekday() value (0=Monday)"""
+    return ("Monday", "Tuesday", "Wednesday", "Thursday",
+            "Friday", "Saturday", "Sunday")[weekday]
+
+def get_stats_cache_ttl():
+    """Seconds until next UTC midnight, plus a grace window for clock skew"""
+    now = datetime.utcnow()
+    next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return int((next_midnight - now).total_seconds()) + 300
+
+async def get_cached_stats(key):
+    """Fetch a cached stats payload; Redis errors are treated as a cache miss"""
+    try:
+        cached = await redis_client.get(key)
+        if cached:
+            return orjson.loads(cached)
+    except Exception as e:
+        logger.warning("Redis GET failed for %s: %s", key, e)
+    return None
+
+async def set_cached_stats(key, payload):
+    """Cache a stats payload until end of day and tag the key for invalidation"""
+    try:
+        await redis_client.setex(key, get_stats_cache_ttl(), orjson.dumps(payload))
+        await redis_client.sadd(STATS_CACHE_KEY_SET, key)
+    except Exception as e:
+        logger.warning("Redis SETEX failed for %s: %s", key, e)
+
+async def bump_today_count(date_str, amount=1):
+    """Increment the Redis counter backing /stats/today"""
+    try:
+        key = f"cnt:{date_str}"
+        await redis_client.incrby(key, amount)
+        await redis_client.expire(key, TODAY_COUNT_TTL)
+    except Exception as e:
+        logger.warning("Redis INCR failed for cnt:%s: %s", date_str, e)
+
+async def get_today_count(today):
+    """Today's deed count from the Redis counter, falling back to Mongo"""
+    key = f"cnt:{today.isoformat()}"
+    try:
+        cached = await redis_client.get(key)
+        if cached is not None:
+            return int(cached)
+    except Exception as e:
+        logger.warning("Redis GET failed for %s: %s", key, e)
+
+    today_start, tomorrow_start = get_today_start_end()
+    count = await db.bad_deeds.count_documents({
+        "timestamp": {
+            "$gte": today_start,
+            "$lt": tomorrow_start
+        }
+    })
+    try:
+        # nx so a concurrent INCRBY that re-created the key isn't clobbered
+        await redis_client.set(key, count, ex=TODAY_COUNT_TTL, nx=True)
+    except Exception as e:
+        logger.warning("Redis SET failed for %s: %s", key, e)
+    return count
+
+async def get_daily_counts(start_date, end_date):
+    """Per-day deed counts for a date range, shared by the daily stats endpoints
+
+    The result is cached in Redis under the date range so concurrent
+    endpoints reuse one aggregation instead of each issuing their own.
+    """
+    cache_key = f"stats:daily:{start_date.isoformat()}:{end_date.isoformat()}"
+    cached = await get_cached_stats(cache_key)
+    if cached is not None:
+        return cached
+
+    pipeline = [
+        {
+            "$match": {
+                "timestamp": {
+                    "$gte": datetime.combine(start_date, datetime.min.time()),
+                    "$lt": datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+                }
+            }
+        },
+        # Shrink documents to the grouped field before grouping
+        {
+            "$project": {"_id": 0, "date_str": 1}
+        },
+        {
+            "$group": {
+                "_id": "$date_str",
+                "count": {"$sum": 1}
+            }
+        },
+        {
+            "$sort": {"_id": 1}
+        }
+    ]
+
+    num_days = (end_date - start_date).days + 1
+    results = await db.bad_deeds.aggregate(pipeline).to_list(num_days)
+    counts = {result["_id"]: result["count"] for result in results}
+    await set_cached_stats(cache_key, counts)
+    return counts
+
+async def invalidate_stats_cache():
+    """Drop all cached stats payloads (the data only changes on new bad deeds)"""
+    try:
+        keys = await redis_client.smembers(STATS_CACHE_KEY_SET)
+        if keys:
+            await redis_client.delete(*keys)
+        await redis_client.delete(STATS_CACHE_KEY_SET)
+    except Exception as e:
+        logger.warning("Redis cache invalidation failed: %s", e)
 
 
 # API Routes
@@ -63,113 +224,136 @@ def get_today_start_end():
 async def root():
     return {"message": "Bad Deeds Tracker API"}
 
-@api_router.post("/bad-deed", response_model=BadDeedResponse)
-async def record_bad_deed(input: BadDeedCreate):
-    """Record a new bad deed"""
+@api_router.post("/bad-deed")
+async def record_bad_deed(request: Request, return_stats: int = 0):
+    """Record a new bad deed
+
+    With return_stats=1 the response also carries today's count before and
+    after the write, saving clients the two stats round trips around a POST.
+    """
+    try:
+        input = bad_deed_create_decoder.decode(await request.body() or b"{}")
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     try:
-        bad_deed = BadDeed(**input.dict())
-        await db.bad_deeds.insert_one(bad_deed.dict())
-        return BadDeedResponse(**bad_deed.dict())
+        # Build the document directly; input is already validated by BadDeedCreate
+        ts = datetime.utcnow()
+        doc = build_deed_doc(input.notes, ts)
+        # Always read (and thereby seed) the counter before bumping it:
+        # otherwise INCRBY re-creates a lost key at 0 and /stats/today
+        # undercounts until the key expires
+        count_before = await get_today_count(ts.date())
+        await db.bad_deeds.insert_one(doc)
+        await bump_today_count(doc["date_str"])
+        await invalidate_stats_cache()
+        if return_stats:
+            return {
+                "id": doc["id"],
+                "timestamp": doc["timestamp"],
+                "count_before": count_before,
+                "count_after": count_before + 1
+            }
+        return msgspec_response(BadDeedResponse(
+            id=doc["id"],
+            timestamp=doc["timestamp"],
+            user_id=doc["user_id"],
+            notes=doc["notes"]
+        ))
     except Exception as e:
-        logging.error(f"Error recording bad deed: {e}")
+        logger.error("Error recording bad deed: %s", e)
         raise HTTPException(status_code=500, detail="Failed to record bad deed")
 
-@api_router.get("/bad-deeds", response_model=List[BadDeedResponse])
+@api_router.post("/bad-deeds/bulk")
+async def record_bad_deeds_bulk(request: Request):
+    """Record multiple bad deeds in a single write (import/sync clients)"""
+    try:
+        items = bad_deed_create_list_decoder.decode(await request.body() or b"[]")
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    try:
+        if not items:
+            return {"inserted": 0}
+
+        ts = datetime.utcnow()
+        docs = [build_deed_doc(item.notes, ts) for item in items]
+        # Seed the counter from Mongo if the key is missing, as in record_bad_deed
+        await get_today_count(ts.date())
+        await db.bad_deeds.insert_many(docs, ordered=False)
+        await bump_today_count(docs[0]["date_str"], amount=len(docs))
+        await invalidate_stats_cache()
+        return {"inserted": len(docs)}
+    except Exception as e:
+        logger.error("Error recording bad deeds in bulk: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to record bad deeds in bulk")
+
+@api_router.get("/bad-deeds")
 async def get_bad_deeds(limit: int = 100):
     """Get all bad deeds (most recent first)"""
     try:
-        bad_deeds = await db.bad_deeds.find().sort("timestamp", -1).limit(limit).to_list(limit)
-        return [BadDeedResponse(**deed) for deed in bad_deeds]
+        projection = {"_id": 0, "id": 1, "timestamp": 1, "user_id": 1, "notes": 1}
+        bad_deeds = await db.bad_deeds.find({}, projection) \
+            .sort("timestamp", -1).hint([("timestamp", -1)]).limit(limit).to_list(limit)
+        # These documents were written by this service, so skip re-validation
+        return msgspec_response([BadDeedResponse(**deed) for deed in bad_deeds])
     except Exception as e:
-        logging.error(f"Error fetching bad deeds: {e}")
+        logger.error("Error fetching bad deeds: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch bad deeds")
 
-@api_router.get("/stats/today", response_model=StatsResponse)
+@api_router.get("/stats/today")
 async def get_today_stats():
     """Get today's bad deed count"""
     try:
-        today_start, today_end = get_today_start_end()
-        
-        count = await db.bad_deeds.count_documents({
-            "timestamp": {
-                "$gte": today_start,
-                "$lte": today_end
-            }
-        })
-        
         today = datetime.utcnow().date()
-        day_of_week = today.strftime("%A")
+        count = await get_today_count(today)
+        day_of_week = day_name(today.weekday())
         
-        return StatsResponse(
+        return msgspec_response(StatsResponse(
             count=count,
             date=today.isoformat(),
             day_of_week=day_of_week
-        )
+        ))
     except Exception as e:
-        logging.error(f"Error getting today's stats: {e}")
+        logger.error("Error getting today's stats: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get today's stats")
 
 @api_router.get("/stats/recent")
 async def get_recent_stats(days: int = 7):
     """Get stats for recent days"""
     try:
+        cache_key = f"stats:recent:{days}"
+        cached = await get_cached_stats(cache_key)
+        if cached is not None:
+            return cached
+
         end_date = datetime.utcnow().date()
         start_date = end_date - timedelta(days=days-1)
-        
-        # Create aggregation pipeline
-        pipeline = [
-            {
-                "$match": {
-                    "timestamp": {
-                        "$gte": datetime.combine(start_date, datetime.min.time()),
-                        "$lte": datetime.combine(end_date, datetime.max.time())
-                    }
-                }
-            },
-            {
-                "$group": {
-                    "_id": {
-                        "$dateToString": {
-                            "format": "%Y-%m-%d",
-                            "date": "$timestamp"
-                        }
-                    },
-                    "count": {"$sum": 1}
-                }
-            },
-            {
-                "$sort": {"_id": 1}
-            }
+
+        results_dict = await get_daily_counts(start_date, end_date)
+
+        # Fill in missing days with 0 count; date strings and day names are
+        # formatted in one vectorized pass instead of per-iteration strftime
+        dates = pd.date_range(start_date, end_date, freq="D")
+        stats = [
+            {"date": date_str, "count": results_dict.get(date_str, 0), "day_of_week": day_name}
+            for date_str, day_name in zip(dates.strftime("%Y-%m-%d"), dates.day_name())
         ]
-        
-        results = await db.bad_deeds.aggregate(pipeline).to_list(days)
-        
-        # Fill in missing days with 0 count
-        stats = []
-        current_date = start_date
-        results_dict = {result["_id"]: result["count"] for result in results}
-        
-        while current_date <= end_date:
-            date_str = current_date.isoformat()
-            count = results_dict.get(date_str, 0)
-            day_of_week = current_date.strftime("%A")
-            
-            stats.append({
-                "date": date_str,
-                "count": count,
-                "day_of_week": day_of_week
-            })
-            current_date += timedelta(days=1)
-        
-        return {"stats": stats}
+
+        result = {"stats": stats}
+        await set_cached_stats(cache_key, result)
+        return result
     except Exception as e:
-        logging.error(f"Error getting recent stats: {e}")
+        logger.error("Error getting recent stats: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get recent stats")
 
 @api_router.get("/stats/day-of-week")
 async def get_day_of_week_analysis():
     """Get day-of-week pattern analysis"""
     try:
+        cache_key = "stats:day-of-week"
+        cached = await get_cached_stats(cache_key)
+        if cached is not None:
+            return cached
+
         # Get data for the last 8 weeks (56 days) for better pattern analysis
         end_date = datetime.utcnow().date()
         start_date = end_date - timedelta(days=55)
@@ -179,24 +363,26 @@ async def get_day_of_week_analysis():
                 "$match": {
                     "timestamp": {
                         "$gte": datetime.combine(start_date, datetime.min.time()),
-                        "$lte": datetime.combine(end_date, datetime.max.time())
+                        "$lt": datetime.combine(end_date + timedelta(days=1), datetime.min.time())
                     }
                 }
             },
+            {
+                "$project": {"_id": 0, "dow": 1, "date_str": 1}
+            },
+            # Count per (dow, day) first, then roll up so distinct days are
+            # counted on the server instead of shipping every date string over
             {
                 "$group": {
-                    "_id": {
-                        "$dayOfWeek": "$timestamp"
-                    },
-                    "count": {"$sum": 1},
-                    "dates": {
-                        "$push": {
-                            "$dateToString": {
-                                "format": "%Y-%m-%d",
-                                "date": "$timestamp"
-                            }
-                        }
-                    }
+                    "_id": {"dow": "$dow", "date_str": "$date_str"},
+                    "count": {"$sum": 1}
+                }
+            },
+            {
+                "$group": {
+                    "_id": "$_id.dow",
+                    "count": {"$sum": "$count"},
+                    "distinct_days": {"$sum": 1}
                 }
             },
             {
@@ -206,17 +392,17 @@ async def get_day_of_week_analysis():
         
         results = await db.bad_deeds.aggregate(pipeline).to_list(7)
         
-        # MongoDB dayOfWeek: 1=Sunday, 2=Monday, ..., 7=Saturday
-        # Convert to more readable format
+        # Stored dow follows Python weekday(): 0=Monday, ..., 6=Sunday.
+        # Keep the Sunday-first output order the frontend expects.
         day_names = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
         day_analysis = []
-        
+
         for i in range(7):
-            mongo_day = i + 1  # MongoDB uses 1-based indexing
-            result = next((r for r in results if r["_id"] == mongo_day), None)
+            dow = (i - 1) % 7  # Sunday-first index -> weekday() value
+            result = next((r for r in results if r["_id"] == dow), None)
             
             if result:
-                unique_dates = len(set(result["dates"]))
+                unique_dates = result["distinct_days"]
                 avg_per_day = result["count"] / unique_dates if unique_dates > 0 else 0
             else:
                 avg_per_day = 0
@@ -241,103 +427,67 @@ async def get_day_of_week_analysis():
         elif max_day["average_per_day"] > min_day["average_per_day"] * 2:
             insights.append(f"You do {max_day['average_per_day']/min_day['average_per_day']:.1f}x more bad deeds on {max_day['day']}s than {min_day['day']}s")
         
-        return {
+        result = {
             "day_analysis": day_analysis,
             "insights": insights,
             "analysis_period": f"{start_date.isoformat()} to {end_date.isoformat()}"
         }
+        await set_cached_stats(cache_key, result)
+        return result
     except Exception as e:
-        logging.error(f"Error getting day-of-week analysis: {e}")
+        logger.error("Error getting day-of-week analysis: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get day-of-week analysis")
 
 @api_router.get("/stats/streaks")
 async def get_streak_analysis():
     """Get current and longest clean streaks"""
     try:
+        cache_key = "stats:streaks"
+        cached = await get_cached_stats(cache_key)
+        if cached is not None:
+            return cached
+
         # Get all days in the last 90 days
         end_date = datetime.utcnow().date()
         start_date = end_date - timedelta(days=89)
-        
-        # Get daily counts
-        pipeline = [
-            {
-                "$match": {
-                    "timestamp": {
-                        "$gte": datetime.combine(start_date, datetime.min.time()),
-                        "$lte": datetime.combine(end_date, datetime.max.time())
-                    }
-                }
-            },
-            {
-                "$group": {
-                    "_id": {
-                        "$dateToString": {
-                            "format": "%Y-%m-%d",
-                            "date": "$timestamp"
-                        }
-                    },
-                    "count": {"$sum": 1}
-                }
-            },
-            {
-                "$sort": {"_id": 1}
+
+        results_dict = await get_daily_counts(start_date, end_date)
+
+        # Dense clean/dirty array over the window (1 = clean day)
+        num_days = (end_date - start_date).days + 1
+        start_ordinal = start_date.toordinal()
+        clean = np.fromiter(
+            (results_dict.get(iso_date(start_ordinal + i), 0) == 0
+             for i in range(num_days)),
+            dtype=np.uint8, count=num_days
+        )
+
+        # Run-length encode the clean runs: pad with zeros so diff marks
+        # every run boundary, then pair up start/end edges
+        edges = np.flatnonzero(np.diff(np.r_[0, clean, 0]))
+        run_starts = edges[::2]
+        run_lengths = edges[1::2] - run_starts
+
+        if run_lengths.size:
+            longest_idx = int(run_lengths.argmax())
+            longest_streak = int(run_lengths[longest_idx])
+            first_clean = start_date + timedelta(days=int(run_starts[longest_idx]))
+            longest_streak_period = {
+                "start": first_clean.isoformat(),
+                "end": (first_clean + timedelta(days=longest_streak - 1)).isoformat(),
+                "days": longest_streak
             }
-        ]
-        
-        results = await db.bad_deeds.aggregate(pipeline).to_list(90)
-        results_dict = {result["_id"]: result["count"] for result in results}
-        
-        # Create day-by-day analysis
-        daily_data = []
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.isoformat()
-            count = results_dict.get(date_str, 0)
-            daily_data.append({
-                "date": date_str,
-                "count": count,
-                "is_clean": count == 0
-            })
-            current_date += timedelta(days=1)
-        
-        # Calculate streaks
-        current_streak = 0
-        longest_streak = 0
+        else:
+            longest_streak = 0
+            longest_streak_period = None
+
+        # Current streak is the trailing clean run, if it reaches today
+        current_streak = int(run_lengths[-1]) if run_lengths.size and clean[-1] else 0
         current_streak_start = None
-        longest_streak_period = None
-        temp_streak_start = None
-        temp_streak = 0
-        
-        # Calculate current streak (from today backwards)
-        for i in range(len(daily_data) - 1, -1, -1):
-            if daily_data[i]["is_clean"]:
-                current_streak += 1
-            else:
-                break
-        
-        # Calculate longest streak
-        for day in daily_data:
-            if day["is_clean"]:
-                if temp_streak == 0:
-                    temp_streak_start = day["date"]
-                temp_streak += 1
-                
-                if temp_streak > longest_streak:
-                    longest_streak = temp_streak
-                    longest_streak_period = {
-                        "start": temp_streak_start,
-                        "end": day["date"],
-                        "days": temp_streak
-                    }
-            else:
-                temp_streak = 0
-                temp_streak_start = None
-        
-        # Calculate current streak start date
         if current_streak > 0:
             current_streak_start = (end_date - timedelta(days=current_streak-1)).isoformat()
-        
-        return {
+
+        result = {
             "current_streak": {
                 "days": current_streak,
                 "start_date": current_streak_start,
@@ -349,35 +499,41 @@ async def get_streak_analysis():
             },
             "analysis_period": f"{start_date.isoformat()} to {end_date.isoformat()}"
         }
+        await set_cached_stats(cache_key, result)
+        return result
     except Exception as e:
-        logging.error(f"Error getting streak analysis: {e}")
+        logger.error("Error getting streak analysis: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get streak analysis")
 
 @api_router.get("/stats/monthly")
 async def get_monthly_stats(months: int = 12):
     """Get monthly statistics"""
     try:
+        cache_key = f"stats:monthly:{months}"
+        cached = await get_cached_stats(cache_key)
+        if cached is not None:
+            return cached
+
         end_date = datetime.utcnow().date()
-        start_date = end_date.replace(day=1) - timedelta(days=30 * (months - 1))
-        start_date = start_date.replace(day=1)  # First day of the start month
+        # First day of the month `months - 1` months back, computed with real
+        # calendar arithmetic rather than a 30-day approximation
+        start_date = (pd.Period(end_date, freq="M") - (months - 1)).to_timestamp().date()
         
         pipeline = [
             {
                 "$match": {
                     "timestamp": {
                         "$gte": datetime.combine(start_date, datetime.min.time()),
-                        "$lte": datetime.combine(end_date, datetime.max.time())
+                        "$lt": datetime.combine(end_date + timedelta(days=1), datetime.min.time())
                     }
                 }
             },
+            {
+                "$project": {"_id": 0, "ym": 1}
+            },
             {
                 "$group": {
-                    "_id": {
-                        "$dateToString": {
-                            "format": "%Y-%m",
-                            "date": "$timestamp"
-                        }
-                    },
+                    "_id": "$ym",
                     "count": {"$sum": 1}
                 }
             },
@@ -390,25 +546,12 @@ async def get_monthly_stats(months: int = 12):
         results_dict = {result["_id"]: result["count"] for result in results}
         
         # Fill in missing months
-        monthly_stats = []
-        current_date = start_date
-        
-        while current_date <= end_date:
-            month_str = current_date.strftime("%Y-%m")
-            count = results_dict.get(month_str, 0)
-            
-            monthly_stats.append({
-                "month": month_str,
-                "month_name": current_date.strftime("%B %Y"),
-                "count": count
-            })
-            
-            # Move to next month
-            if current_date.month == 12:
-                current_date = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                current_date = current_date.replace(month=current_date.month + 1)
-        
+        month_starts = pd.date_range(start_date, end_date, freq="MS")
+        monthly_stats = [
+            {"month": month_str, "month_name": month_name, "count": results_dict.get(month_str, 0)}
+            for month_str, month_name in zip(month_starts.strftime("%Y-%m"), month_starts.strftime("%B %Y"))
+        ]
+
         # Calculate trend
         if len(monthly_stats) >= 2:
             recent_avg = sum(stat["count"] for stat in monthly_stats[-3:]) / min(3, len(monthly_stats))
@@ -422,13 +565,15 @@ async def get_monthly_stats(months: int = 12):
         else:
             trend = "insufficient_data"
         
-        return {
+        result = {
             "monthly_stats": monthly_stats,
             "trend": trend,
             "total_period": sum(stat["count"] for stat in monthly_stats)
         }
+        await set_cached_stats(cache_key, result)
+        return result
     except Exception as e:
-        logging.error(f"Error getting monthly stats: {e}")
+        logger.error("Error getting monthly stats: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get monthly stats")
 
 @api_router.get("/stats/calendar")
@@ -449,51 +594,22 @@ async def get_calendar_heatmap(year: Optional[int] = None, month: Optional[int]
             last_day = date(year, month + 1, 1) - timedelta(days=1)
         
         # Get daily aggregation for the month
-        pipeline = [
-            {
-                "$match": {
-                    "timestamp": {
-                        "$gte": datetime.combine(first_day, datetime.min.time()),
-                        "$lte": datetime.combine(last_day, datetime.max.time())
-                    }
-                }
-            },
-            {
-                "$group": {
-                    "_id": {
-                        "$dateToString": {
-                            "format": "%Y-%m-%d",
-                            "date": "$timestamp"
-                        }
-                    },
-                    "count": {"$sum": 1}
-                }
-            },
+        results_dict = await get_daily_counts(first_day, last_day)
+
+        # Create calendar data
+        dates = pd.date_range(first_day, last_day, freq="D")
+        calendar_data = [
             {
-                "$sort": {"_id": 1}
+                "date": date_str,
+                "day": int(day),
+                "count": results_dict.get(date_str, 0),
+                "day_of_week": day_name,
+                "day_of_week_short": day_name[:3]
             }
+            for date_str, day, day_name in zip(
+                dates.strftime("%Y-%m-%d"), dates.day, dates.day_name())
         ]
-        
-        results = await db.bad_deeds.aggregate(pipeline).to_list(31)  # Max 31 days in a month
-        results_dict = {result["_id"]: result["count"] for result in results}
-        
-        # Create calendar data
-        calendar_data = []
-        current_date = first_day
-        
-        while current_date <= last_day:
-            date_str = current_date.isoformat()
-            count = results_dict.get(date_str, 0)
-            
-            calendar_data.append({
-                "date": date_str,
-                "day": current_date.day,
-                "count": count,
-                "day_of_week": current_date.strftime("%A"),
-                "day_of_week_short": current_date.strftime("%a")
-            })
-            current_date += timedelta(days=1)
-        
+
         # Calculate statistics for the month
         total_bad_deeds = sum(day["count"] for day in calendar_data)
         days_with_bad_deeds = len([day for day in calendar_data if day["count"] > 0])
@@ -521,28 +637,71 @@ async def get_calendar_heatmap(year: Optional[int] = None, month: Optional[int]
             }
         }
     except Exception as e:
-        logging.error(f"Error getting calendar heatmap: {e}")
+        logger.error("Error getting calendar heatmap: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get calendar heatmap")
 
 
 # Include the router in the main app
 app.include_router(api_router)
 
+@app.on_event("startup")
+async def ensure_indexes():
+    """Index timestamp so stats $match stages and the recency sort use IXSCAN"""
+    # One log line to catch accidental double registration of the router
+    logger.info("Registered %d routes", len(app.routes))
+    # Ping first so the connection pool is warm before the first request
+    await client.admin.command("ping")
+    await db.bad_deeds.create_index([("timestamp", -1)])
+    await db.bad_deeds.create_index([("date_str", 1)])
+    await db.bad_deeds.create_index([("ym", 1)])
+    # One-time backfill: deeds written before the materialized date fields
+    # existed would otherwise be invisible to every stats pipeline
+    await db.bad_deeds.update_many(
+        {"date_str": {"$exists": False}},
+        [{
+            "$set": {
+                "date_str": {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}},
+                "ym": {"$dateToString": {"format": "%Y-%m", "date": "$timestamp"}},
+                # Mongo $dayOfWeek is 1=Sunday..7=Saturday; stored dow follows
+                # Python weekday() (0=Monday..6=Sunday)
+                "dow": {"$mod": [{"$add": [{"$dayOfWeek": "$timestamp"}, 5]}, 7]}
+            }
+        }]
+    )
+
+# The repetitive dated JSON of the stats endpoints compresses ~10x; level 1
+# keeps the CPU cost well below the bandwidth savings
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=1)
+
+# CORS: origins come from the environment (comma-separated), credentials stay
+# off since the API is tokenless, and preflight responses are cached for 24h
+cors_origins = [origin.strip() for origin in os.environ.get('CORS_ORIGINS', '*').split(',')]
 app.add_middleware(
     CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=["*"],
+    allow_credentials=False,
+    allow_origins=cors_origins,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
-# Configure logging
+# Configure logging: records go through a queue so the stream I/O happens on
+# a background thread instead of blocking the event loop
+log_queue = queue.Queue(-1)
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+)
+log_listener = QueueListener(log_queue, stream_handler)
+log_listener.start()
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    handlers=[QueueHandler(log_queue)]
 )
 logger = logging.getLogger(__name__)
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
+    await redis_client.aclose()
+    log_listener.stop()
@@ -0,0 +1,87 @@
+"""Pytest port of the API suite, runnable with pytest-xdist:
+
+    pytest tests/test_api.py -n auto --dist=loadfile
+
+Each xdist worker is a separate process, so independent tests fan out
+across cores; --dist=loadfile keeps this file's tests on one worker so
+they share the session-scoped client. backend_test.py remains the
+standalone async runner for ad-hoc use.
+"""
+import os
+
+import httpx
+import pytest
+
+BASE_URL = os.environ.get(
+    "API_BASE_URL",
+    "https://bc9462b8-3b71-4834-92ff-60c33acd210b.preview.emergentagent.com",
+)
+
+
+@pytest.fixture(scope="session")
+def api_client():
+    """One keep-alive client per worker, skipping the file if the server
+    is unreachable"""
+    with httpx.Client(
+        base_url=f"{BASE_URL}/api",
+        timeout=httpx.Timeout(10.0, connect=2.0),
+        headers={"Accept-Encoding": "gzip, deflate"},
+    ) as client:
+        try:
+            client.get("/")
+        except httpx.HTTPError as e:
+            pytest.skip(f"API server unreachable: {e}")
+        yield client
+
+
+def test_api_root(api_client):
+    assert api_client.get("/").status_code == 200
+
+
+def test_record_bad_deed_returns_count_delta(api_client):
+    response = api_client.post("/bad-deed?return_stats=1", json={})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["id"]
+    assert body["count_after"] == body["count_before"] + 1
+
+
+def test_today_stats(api_client):
+    response = api_client.get("/stats/today")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] >= 0
+    assert body["date"]
+    assert body["day_of_week"]
+
+
+def test_recent_stats_fills_every_day(api_client):
+    response = api_client.get("/stats/recent", params={"days": 7})
+    assert response.status_code == 200
+    assert len(response.json()["stats"]) == 7
+
+
+def test_bad_deeds_list_respects_limit(api_client):
+    response = api_client.get("/bad-deeds", params={"limit": 10})
+    assert response.status_code == 200
+    assert len(response.json()) <= 10
+
+
+def test_day_of_week_analysis_covers_week(api_client):
+    response = api_client.get("/stats/day-of-week")
+    assert response.status_code == 200
+    assert len(response.json()["day_analysis"]) == 7
+
+
+def test_streak_analysis(api_client):
+    response = api_client.get("/stats/streaks")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["current_streak"]["days"] >= 0
+    assert body["longest_streak"]["days"] >= 0
+
+
+def test_monthly_stats_fills_every_month(api_client):
+    response = api_client.get("/stats/monthly", params={"months": 6})
+    assert response.status_code == 200
+    assert len(response.json()["monthly_stats"]) == 6